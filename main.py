@@ -1,40 +1,29 @@
+import asyncio
 import discord
 from discord.ext import commands
+from functools import lru_cache
 import os
-import re
-from typing import Optional, List, Dict
+import random
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional, List, Dict
 from supabase import create_client, Client
-from flask import Flask
-from threading import Thread
+from aiohttp import web
 
-# Keep-alive web server for Render
-app = Flask('')
+# Keep-alive endpoints for Render, served on the bot's own event loop
+# (no extra thread, no WSGI stack)
+async def home(request):
+    return web.Response(text="Bot is running!")
 
-@app.route('/')
-def home():
-    return "Bot is running!", 200
-
-@app.route('/health')
-def health():
-    return {"status": "alive", "bot": bot.user.name if bot.user else "starting"}, 200
-
-def run_flask():
-    port = int(os.environ.get('PORT', 8080))  # Render provides PORT env var
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
-
-def keep_alive():
-    port = int(os.environ.get('PORT', 8080))
-    print(f"🌐 Starting keep-alive web server on port {port}...")
-    t = Thread(target=run_flask)
-    t.daemon = True
-    t.start()
-    print("✅ Web server thread started!")
+async def health(request):
+    return web.json_response({"status": "alive", "bot": bot.user.name if bot.user else "starting"})
 
 # Bot configuration
 TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 LEADERBOARD_CHANNEL = int(os.getenv('LEADERBOARD_CHANNEL', '0'))
+# Cap on in-flight Supabase requests; 8 matches the PostgREST default pool
+DB_CONCURRENCY = int(os.getenv('DB_CONCURRENCY', '8'))
 
 # Competition maps - 5 maps total
 COMPETITION_MAPS = {
@@ -45,6 +34,21 @@ COMPETITION_MAPS = {
     5: "Cold and Mad Pt 2 05"
 }
 
+# Leaderboard data only changes on time submission, so repeat !tm calls
+# can be served from a short-lived local cache.
+LB_CACHE_TTL = 60.0
+LB_CACHE_JITTER = 15.0
+
+# Derived map constants, precomputed so commands don't rebuild them
+_MAP_KEYS = frozenset(COMPETITION_MAPS)
+_MAP_KEYS_LIST = list(COMPETITION_MAPS)
+_MAP_KEYS_STR = ', '.join(map(str, COMPETITION_MAPS))
+_MAP_COUNT = len(COMPETITION_MAPS)
+
+# Static render pieces for show_leaderboard
+_LB_HEADER = "**Campaign Competition Leaderboard**\n\n"
+_MEDALS = ["🥇", "🥈", "🥉"]
+
 class CampaignBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -52,10 +56,41 @@ class CampaignBot(commands.Bot):
         super().__init__(command_prefix='!tm ', intents=intents)
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
         self.remove_command('help')
+        self._lb_cache: Dict[str, tuple] = {}
+        self._lb_lock = asyncio.Lock()
+        self.db_sem = asyncio.Semaphore(DB_CONCURRENCY)
+
+    async def cached(self, key: str, coro_factory: Callable[[], Awaitable[Any]], ttl: float = LB_CACHE_TTL) -> Any:
+        """Return a cached result for key, refreshing it once ttl expires"""
+        async with self._lb_lock:
+            hit = self._lb_cache.get(key)
+            if hit and monotonic() < hit[0]:
+                return hit[1]
+            value = await coro_factory()
+            # Jitter the expiry so hot keys don't all refresh on the same tick
+            expires = monotonic() + ttl + random.uniform(-LB_CACHE_JITTER, LB_CACHE_JITTER)
+            self._lb_cache[key] = (expires, value)
+            return value
+
+    def invalidate_cache(self, *keys: str):
+        """Drop cached leaderboard entries after a write"""
+        for key in keys:
+            self._lb_cache.pop(key, None)
 
     async def setup_hook(self):
+        await self.start_web_server()
         print("🏁 Campaign Competition Bot is ready!")
-        print(f"📊 Competition maps: {list(COMPETITION_MAPS.keys())}")
+        print(f"📊 Competition maps: {_MAP_KEYS_LIST}")
+
+    async def start_web_server(self):
+        port = int(os.environ.get('PORT', 8080))  # Render provides PORT env var
+        app = web.Application()
+        app.router.add_get('/', home)
+        app.router.add_get('/health', health)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '0.0.0.0', port).start()
+        print(f"🌐 Keep-alive web server listening on port {port}")
 
 bot = CampaignBot()
 
@@ -73,11 +108,12 @@ async def register_player(ctx, *, trackmania_username: str):
         return
     
     try:
-        # Upsert player (insert or update if exists)
-        bot.supabase.table('players').upsert({
+        # Upsert player (insert or update if exists); the returned row
+        # is never read, so skip serializing it
+        await run_db(bot.supabase.table('players').upsert({
             'discord_id': str(ctx.author.id),
             'tm_username': trackmania_username
-        }).execute()
+        }, returning='minimal'))
         
         await ctx.send(f"✅ Registered `{trackmania_username}` for {ctx.author.mention}!")
     except Exception as e:
@@ -87,15 +123,9 @@ async def register_player(ctx, *, trackmania_username: str):
 @bot.command(name='time', aliases=['submit', 't'])
 async def submit_time(ctx, map_num: int, *, time_str: str):
     """Submit a time for a map"""
-    # Check if player is registered
-    result = bot.supabase.table('players').select('tm_username').eq('discord_id', str(ctx.author.id)).execute()
-    if not result.data:
-        await ctx.send("❌ Please register first with `!tm register <your_trackmania_username>`")
-        return
-
     # Check if valid map
-    if map_num not in COMPETITION_MAPS:
-        await ctx.send(f"❌ Invalid map! Choose from: {', '.join(map(str, COMPETITION_MAPS.keys()))}")
+    if map_num not in _MAP_KEYS:
+        await ctx.send(f"❌ Invalid map! Choose from: {_MAP_KEYS_STR}")
         return
 
     # Parse time
@@ -109,28 +139,25 @@ async def submit_time(ctx, map_num: int, *, time_str: str):
         return
 
     try:
+        # The submit_time function (see supabase/migrations) checks
+        # registration, records history, upserts the best time, and
+        # computes the resulting map rank in a single round-trip.
+        result = await run_db(bot.supabase.rpc('submit_time', {
+            'did': str(ctx.author.id),
+            'map': map_num,
+            'ms': time_ms
+        }))
+        if not result.data:
+            await ctx.send("❌ Please register first with `!tm register <your_trackmania_username>`")
+            return
+
         tm_username = result.data[0]['tm_username']
-        
-        # Get player's previous best time for this map
-        previous_times = bot.supabase.table('times').select('time_ms').eq('discord_id', str(ctx.author.id)).eq('map_number', map_num).order('time_ms', desc=False).limit(1).execute()
-        
-        previous_best = previous_times.data[0]['time_ms'] if previous_times.data else None
+        previous_best = result.data[0]['previous_best']
         is_improvement = previous_best is None or time_ms < previous_best
-        
-        # Insert new time into time_history (tracks all submissions)
-        bot.supabase.table('time_history').insert({
-            'discord_id': str(ctx.author.id),
-            'map_number': map_num,
-            'time_ms': time_ms
-        }).execute()
-        
-        # Update current best time in times table (for leaderboards)
+
         if is_improvement:
-            bot.supabase.table('times').upsert({
-                'discord_id': str(ctx.author.id),
-                'map_number': map_num,
-                'time_ms': time_ms
-            }).execute()
+            # Leaderboards for this map and the standings just changed
+            bot.invalidate_cache(f'map:{map_num}', 'overall')
 
         formatted_time = format_time(time_ms)
         
@@ -149,8 +176,8 @@ async def submit_time(ctx, map_num: int, *, time_str: str):
             else:
                 embed.add_field(name="🔄", value="Same as previous best", inline=True)
 
-        # Check position on map leaderboard
-        position = await get_player_position(map_num, ctx.author.id)
+        # Position comes back from the RPC; no second leaderboard fetch
+        position = result.data[0]['rank']
         if position == 1:
             embed.add_field(name="🏆", value="First place!", inline=True)
         elif position <= 3:
@@ -162,53 +189,89 @@ async def submit_time(ctx, map_num: int, *, time_str: str):
         print(f"Error submitting time: {e}")
         await ctx.send("❌ Failed to submit time. Please try again.")
 
+def _build_overall_embed(overall: List[Dict]) -> discord.Embed:
+    """Build the overall standings embed (one bounded page)"""
+    description = _LB_HEADER
+    if not overall:
+        description += "No times submitted yet"
+    for i, player in enumerate(overall[:10]):
+        medal = _MEDALS[i] if i < 3 else f"#{i+1}"
+        description += f"{medal} {player['tm_username']} — {player['points']} pts ({player['maps_completed']}/{_MAP_COUNT} maps)\n"
+
+    return discord.Embed(
+        title="🏁 Campaign Competition",
+        description=description,
+        color=discord.Color.green()
+    )
+
+def _build_map_embed(map_num: int, map_lb: List[Dict]) -> discord.Embed:
+    """Build the leaderboard embed for a single map"""
+    embed = discord.Embed(
+        title=f"🗺️ {COMPETITION_MAPS[map_num]} Leaderboard",
+        color=discord.Color.orange()
+    )
+
+    for i, entry in enumerate(map_lb[:10], 1):
+        time_str = format_time(entry['time_ms'])
+
+        if i == 1:
+            display = f"⏱️ {time_str}"
+        else:
+            diff = entry['time_ms'] - map_lb[0]['time_ms']
+            display = f"⏱️ {time_str} (+{format_time(diff)})"
+
+        embed.add_field(
+            name=f"#{i} - {entry['tm_username']}",
+            value=display,
+            inline=False
+        )
+
+    return embed
+
+class _OverallPageButton(discord.ui.Button):
+    def __init__(self):
+        super().__init__(label="Overall", style=discord.ButtonStyle.primary)
+
+    async def callback(self, interaction: discord.Interaction):
+        overall = await get_overall_standings()
+        await interaction.response.edit_message(embed=_build_overall_embed(overall), view=self.view)
+
+class _MapPageButton(discord.ui.Button):
+    def __init__(self, map_num: int):
+        super().__init__(label=f"Map {map_num}", style=discord.ButtonStyle.secondary)
+        self.map_num = map_num
+
+    async def callback(self, interaction: discord.Interaction):
+        map_lb = await get_map_leaderboard(self.map_num)
+        if not map_lb:
+            embed = discord.Embed(
+                title=f"🗺️ {COMPETITION_MAPS[self.map_num]} Leaderboard",
+                description="No times submitted yet",
+                color=discord.Color.orange()
+            )
+        else:
+            embed = _build_map_embed(self.map_num, map_lb)
+        await interaction.response.edit_message(embed=embed, view=self.view)
+
+class LeaderboardView(discord.ui.View):
+    """Pagination for !tm leaderboard.
+
+    Only the overall standings page is rendered up front; per-map pages
+    are fetched lazily on button click, which keeps every embed well
+    under Discord's description limit as the player count grows.
+    """
+    def __init__(self):
+        super().__init__(timeout=180)
+        self.add_item(_OverallPageButton())
+        for map_num in COMPETITION_MAPS:
+            self.add_item(_MapPageButton(map_num))
+
 @bot.command(name='leaderboard', aliases=['lb'])
 async def show_leaderboard(ctx):
-    """Show the full competition leaderboard"""
+    """Show the competition leaderboard"""
     try:
-        description = "**Campaign Competition Leaderboard**\n\n"
-        medals = ["🥇", "🥈", "🥉"]
-        
-        # Show each map's leaderboard
-        for map_num in COMPETITION_MAPS.keys():
-            map_lb = await get_map_leaderboard(map_num)
-            
-            description += f"**{COMPETITION_MAPS[map_num]}**\n"
-            
-            if not map_lb:
-                description += "No times submitted\n\n"
-                continue
-            
-            for i, entry in enumerate(map_lb[:10]):  # Top 10
-                medal = medals[i] if i < 3 else f"#{i+1}"
-                time_str = format_time(entry['time_ms'])
-                
-                split_text = ""
-                if i > 0:
-                    diff = entry['time_ms'] - map_lb[0]['time_ms']
-                    split_text = f" (+{format_time(diff)})"
-                
-                description += f"{medal} {entry['tm_username']} — {time_str}{split_text}\n"
-            
-            description += "\n"
-        
-        # Overall standings (by points)
         overall = await get_overall_standings()
-        if overall:
-            description += "**Overall Standings**\n"
-            for i, player in enumerate(overall[:10]):
-                medal = medals[i] if i < 3 else f"#{i+1}"
-                total_maps = len(COMPETITION_MAPS)
-                description += f"{medal} {player['tm_username']} — {player['points']} pts ({player['maps_completed']}/{total_maps} maps)\n"
-        
-        embed = discord.Embed(
-            title="🏁 Campaign Competition",
-            description=description,
-            color=discord.Color.green()
-        )
-        
-        await ctx.send(embed=embed)
-        
+        await ctx.send(embed=_build_overall_embed(overall), view=LeaderboardView())
     except Exception as e:
         print(f"Error showing leaderboard: {e}")
         await ctx.send("❌ Failed to load leaderboard.")
@@ -216,39 +279,19 @@ async def show_leaderboard(ctx):
 @bot.command(name='map')
 async def show_map_leaderboard(ctx, map_num: int):
     """Show leaderboard for a specific map"""
-    if map_num not in COMPETITION_MAPS:
-        await ctx.send(f"❌ Invalid map! Choose from: {', '.join(map(str, COMPETITION_MAPS.keys()))}")
+    if map_num not in _MAP_KEYS:
+        await ctx.send(f"❌ Invalid map! Choose from: {_MAP_KEYS_STR}")
         return
-    
+
     try:
         map_lb = await get_map_leaderboard(map_num)
-        
+
         if not map_lb:
             await ctx.send(f"📊 No times submitted for {COMPETITION_MAPS[map_num]} yet!")
             return
-        
-        embed = discord.Embed(
-            title=f"🗺️ {COMPETITION_MAPS[map_num]} Leaderboard",
-            color=discord.Color.orange()
-        )
-        
-        for i, entry in enumerate(map_lb[:10], 1):
-            time_str = format_time(entry['time_ms'])
-            
-            if i == 1:
-                display = f"⏱️ {time_str}"
-            else:
-                diff = entry['time_ms'] - map_lb[0]['time_ms']
-                display = f"⏱️ {time_str} (+{format_time(diff)})"
-            
-            embed.add_field(
-                name=f"#{i} - {entry['tm_username']}",
-                value=display,
-                inline=False
-            )
-        
-        await ctx.send(embed=embed)
-        
+
+        await ctx.send(embed=_build_map_embed(map_num, map_lb))
+
     except Exception as e:
         print(f"Error showing map leaderboard: {e}")
         await ctx.send("❌ Failed to load map leaderboard.")
@@ -257,28 +300,32 @@ async def show_map_leaderboard(ctx, map_num: int):
 async def show_my_stats(ctx):
     """Show your personal stats"""
     try:
-        result = bot.supabase.table('players').select('tm_username').eq('discord_id', str(ctx.author.id)).execute()
+        result = await run_db(bot.supabase.table('players').select('tm_username').eq('discord_id', str(ctx.author.id)))
         if not result.data:
             await ctx.send("❌ You're not registered! Use `!tm register <username>`")
             return
         
         tm_username = result.data[0]['tm_username']
         
-        # Get all player's times
-        times_result = bot.supabase.table('times').select('*').eq('discord_id', str(ctx.author.id)).execute()
-        
+        # Get all player's times and their ranks across every map at once
+        times_result = await run_db(bot.supabase.table('times').select('map_number, time_ms').eq('discord_id', str(ctx.author.id)))
+        times_by_map = {t['map_number']: t for t in times_result.data}
+
+        ranks_result = await run_db(bot.supabase.rpc('get_player_ranks', {'did': str(ctx.author.id)}))
+        ranks = {r['map_number']: r['pos'] for r in ranks_result.data}
+
         embed = discord.Embed(
             title=f"📊 Stats for {tm_username}",
             color=discord.Color.blue()
         )
-        
+
         total_points = 0
         for map_num in COMPETITION_MAPS.keys():
-            player_time = next((t for t in times_result.data if t['map_number'] == map_num), None)
-            
+            player_time = times_by_map.get(map_num)
+
             if player_time:
                 time_str = format_time(player_time['time_ms'])
-                position = await get_player_position(map_num, ctx.author.id)
+                position = ranks.get(map_num, 0)
                 points = get_points_for_position(position)
                 total_points += points
                 
@@ -306,143 +353,160 @@ async def show_my_stats(ctx):
         print(f"Error showing stats: {e}")
         await ctx.send("❌ Failed to load stats.")
 
+# The help text never changes, so the embed is built once at import
+_HELP_EMBED = discord.Embed(
+    title="🏁 Campaign Competition Commands",
+    description="2-week competition on 5 Campaign maps",
+    color=discord.Color.blue()
+)
+_HELP_EMBED.add_field(
+    name="📝 Registration & Submission",
+    value=(
+        "`!tm register <username>` - Register for competition\n"
+        "`!tm time <map> <time>` - Submit time (e.g. `!tm time 1 1:23.456`)"
+    ),
+    inline=False
+)
+_HELP_EMBED.add_field(
+    name="📊 Leaderboards",
+    value=(
+        "`!tm leaderboard` - View full leaderboard\n"
+        "`!tm map <number>` - View specific map (1-5)\n"
+        "`!tm mystats` - View your personal stats"
+    ),
+    inline=False
+)
+_HELP_EMBED.add_field(
+    name="⏱️ Time Formats",
+    value="`1:23.456` or `83.456` or `83456` (milliseconds)",
+    inline=False
+)
+_HELP_EMBED.add_field(
+    name="🏆 Points System",
+    value="1st: 25pts • 2nd: 18pts • 3rd: 15pts • 4th: 12pts • 5th: 10pts\nLower: 8, 6, 4, 2, 1",
+    inline=False
+)
+
 @bot.command(name='help', aliases=['commands', 'h'])
 async def show_help(ctx):
     """Show all commands"""
-    embed = discord.Embed(
-        title="🏁 Campaign Competition Commands",
-        description="2-week competition on 5 Campaign maps",
-        color=discord.Color.blue()
-    )
-    
-    embed.add_field(
-        name="📝 Registration & Submission",
-        value=(
-            "`!tm register <username>` - Register for competition\n"
-            "`!tm time <map> <time>` - Submit time (e.g. `!tm time 1 1:23.456`)"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="📊 Leaderboards",
-        value=(
-            "`!tm leaderboard` - View full leaderboard\n"
-            "`!tm map <number>` - View specific map (1-5)\n"
-            "`!tm mystats` - View your personal stats"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="⏱️ Time Formats",
-        value="`1:23.456` or `83.456` or `83456` (milliseconds)",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="🏆 Points System",
-        value="1st: 25pts • 2nd: 18pts • 3rd: 15pts • 4th: 12pts • 5th: 10pts\nLower: 8, 6, 4, 2, 1",
-        inline=False
-    )
-    
-    await ctx.send(embed=embed)
+    await ctx.send(embed=_HELP_EMBED)
 
 # ==================== HELPER FUNCTIONS ====================
 
+async def run_db(query):
+    """Execute a supabase-py query in a worker thread.
+
+    supabase-py is synchronous, so calling .execute() directly would
+    block the event loop and stall every other command in flight. The
+    semaphore keeps a command burst from saturating the PostgREST pool.
+    """
+    async with bot.db_sem:
+        return await asyncio.to_thread(query.execute)
+
 async def get_map_leaderboard(map_num: int) -> List[Dict]:
-    """Get sorted leaderboard for a specific map"""
-    result = bot.supabase.table('times').select('*, players(tm_username)').eq('map_number', map_num).execute()
-    
-    leaderboard = []
+    """Get sorted leaderboard for a specific map (cached)"""
+    return await bot.cached(f'map:{map_num}', lambda: _fetch_map_leaderboard(map_num))
+
+async def _fetch_map_leaderboard(map_num: int) -> List[Dict]:
+    # Sort and top-10 cut happen in Postgres, backed by the
+    # (map_number, time_ms) index
+    result = await run_db(bot.supabase.table('map_leaderboard').select('time_ms, discord_id, tm_username').eq('map_number', map_num).order('time_ms', desc=False).limit(10))
+    return result.data
+
+async def get_overall_standings() -> List[Dict]:
+    """Get overall standings based on points (cached)"""
+    return await bot.cached('overall', _fetch_overall_standings)
+
+async def _fetch_overall_standings() -> List[Dict]:
+    # Points are aggregated by the overall_standings view (see
+    # supabase/migrations), so the whole table is one round-trip.
+    try:
+        result = await run_db(bot.supabase.table('overall_standings').select('discord_id, tm_username, points, maps_completed').order('points', desc=True).order('maps_completed', desc=True))
+        return result.data
+    except Exception as e:
+        print(f"overall_standings view unavailable, aggregating locally: {e}")
+        return await _aggregate_standings()
+
+async def _aggregate_standings() -> List[Dict]:
+    """Compute standings from one fetch of all times (RPC fallback)"""
+    # Rows arrive sorted by (map_number, time_ms), so a single pass with
+    # a rank counter replaces the old per-player per-map query fan-out.
+    result = await run_db(bot.supabase.table('times').select('map_number, time_ms, discord_id, players(tm_username)').order('map_number').order('time_ms'))
+
+    standings: Dict[str, Dict] = {}
+    current_map = None
+    rank = 0
     for entry in result.data:
-        leaderboard.append({
+        if entry['map_number'] != current_map:
+            current_map = entry['map_number']
+            rank = 0
+        rank += 1
+        player = standings.setdefault(entry['discord_id'], {
             'discord_id': entry['discord_id'],
             'tm_username': entry['players']['tm_username'],
-            'time_ms': entry['time_ms']
+            'points': 0,
+            'maps_completed': 0
         })
-    
-    return sorted(leaderboard, key=lambda x: x['time_ms'])
+        player['points'] += get_points_for_position(rank)
+        player['maps_completed'] += 1
 
-async def get_player_position(map_num: int, discord_id: int) -> int:
-    """Get player's position on a map's leaderboard"""
-    leaderboard = await get_map_leaderboard(map_num)
-    for i, entry in enumerate(leaderboard, 1):
-        if entry['discord_id'] == str(discord_id):
-            return i
-    return 0
+    return sorted(standings.values(), key=lambda x: (-x['points'], -x['maps_completed']))
 
-async def get_overall_standings() -> List[Dict]:
-    """Get overall standings based on points"""
-    # Get all players
-    players_result = bot.supabase.table('players').select('*').execute()
-    
-    standings = []
-    for player in players_result.data:
-        discord_id = player['discord_id']
-        
-        # Get player's times
-        times_result = bot.supabase.table('times').select('*').eq('discord_id', discord_id).execute()
-        
-        total_points = 0
-        maps_completed = len(times_result.data)
-        
-        # Calculate points from each map
-        for time_entry in times_result.data:
-            position = await get_player_position(time_entry['map_number'], int(discord_id))
-            total_points += get_points_for_position(position)
-        
-        standings.append({
-            'discord_id': discord_id,
-            'tm_username': player['tm_username'],
-            'points': total_points,
-            'maps_completed': maps_completed
-        })
-    
-    return sorted(standings, key=lambda x: (-x['points'], -x['maps_completed']))
+# Points per leaderboard position; everyone below top 10 gets 1
+_POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
 
 def get_points_for_position(position: int) -> int:
     """Get points awarded for a leaderboard position"""
-    point_values = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
     if position == 0:
         return 0
-    if position <= len(point_values):
-        return point_values[position - 1]
+    if position <= len(_POINTS):
+        return _POINTS[position - 1]
     return 1
 
-def parse_time(time_str: str) -> Optional[int]:
-    """Parse time string into milliseconds"""
-    time_str = time_str.strip().replace(',', '.')
+_TIME_TRANS = str.maketrans({',': '.'})
 
-    # M:SS.mmm or M:SS:mmm
-    match = re.match(r'^(\d+):(\d{1,2})[:.](\d{1,3})$', time_str)
-    if match:
-        minutes, seconds, ms = match.groups()
-        ms = ms.ljust(3, '0')[:3]
-        return int(minutes) * 60000 + int(seconds) * 1000 + int(ms)
+def _is_digits(s: str) -> bool:
+    # str.isdigit alone accepts characters like '²' that int() rejects
+    return s.isascii() and s.isdigit()
 
-    # SS.mmm
-    match = re.match(r'^(\d+)\.(\d{1,3})$', time_str)
-    if match:
-        seconds, ms = match.groups()
-        ms = ms.ljust(3, '0')[:3]
-        return int(seconds) * 1000 + int(ms)
+def parse_time(time_str: str) -> Optional[int]:
+    """Parse time string into milliseconds"""
+    # The accepted formats are simple enough that str.split beats the
+    # regex engine on the submission hot path
+    time_str = time_str.strip().translate(_TIME_TRANS)
 
     # Raw milliseconds
-    match = re.match(r'^(\d+)$', time_str)
-    if match:
+    if _is_digits(time_str):
         return int(time_str)
 
-    return None
+    # M:SS.mmm or M:SS:mmm
+    if ':' in time_str:
+        minutes, rest = time_str.split(':', 1)
+        sep = ':' if ':' in rest else '.'
+        seconds, _, ms = rest.partition(sep)
+        if not (_is_digits(minutes) and _is_digits(seconds) and _is_digits(ms)):
+            return None
+        if len(seconds) > 2 or len(ms) > 3:
+            return None
+        return int(minutes) * 60000 + int(seconds) * 1000 + int(ms.ljust(3, '0'))
+
+    # SS.mmm
+    seconds, _, ms = time_str.partition('.')
+    if not (_is_digits(seconds) and _is_digits(ms)) or len(ms) > 3:
+        return None
+    return int(seconds) * 1000 + int(ms.ljust(3, '0'))
 
+@lru_cache(maxsize=4096)
 def format_time(ms: int) -> str:
     """Format milliseconds as MM:SS.mmm"""
+    # Called ~100x per leaderboard render (times + diffs), and diff
+    # values recur across players, hence the cache
     if ms <= 0:
         return "00:00.000"
-    minutes = ms // 60000
-    seconds = (ms % 60000) // 1000
-    milliseconds = ms % 1000
-    return f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+    s, msec = divmod(ms, 1000)
+    m, sec = divmod(s, 60)
+    return f"{m:02d}:{sec:02d}.{msec:03d}"
 
 # ==================== RUN BOT ====================
 
@@ -453,5 +517,4 @@ if __name__ == "__main__":
         exit(1)
     
     print("🚀 Starting Campaign Competition Bot...")
-    keep_alive()  # Start web server for Render
     bot.run(TOKEN)
@@ -0,0 +1,65 @@
+-- Rank/standings computed server-side so the bot needs one round-trip
+-- instead of re-fetching every leaderboard per player.
+
+-- Overall standings: rank every time per map with a window function,
+-- convert rank to points, sum per player.
+create or replace function get_standings()
+returns table (
+    discord_id text,
+    tm_username text,
+    points bigint,
+    maps_completed bigint
+)
+language sql
+stable
+as $$
+    with ranked as (
+        select
+            discord_id,
+            map_number,
+            rank() over (partition by map_number order by time_ms asc) as pos
+        from times
+    )
+    select
+        p.discord_id,
+        p.tm_username,
+        sum(case r.pos
+            when 1 then 25
+            when 2 then 18
+            when 3 then 15
+            when 4 then 12
+            when 5 then 10
+            when 6 then 8
+            when 7 then 6
+            when 8 then 4
+            when 9 then 2
+            when 10 then 1
+            else 1
+        end) as points,
+        count(*) as maps_completed
+    from ranked r
+    join players p using (discord_id)
+    group by p.discord_id, p.tm_username
+    order by points desc, maps_completed desc;
+$$;
+
+-- Single player's rank on one map, without shipping the whole board.
+-- Returns 0 when the player has no time on the map.
+create or replace function get_player_rank(map int, did text)
+returns int
+language sql
+stable
+as $$
+    with me as (
+        select time_ms from times
+        where map_number = map and discord_id = did
+    )
+    select case
+        when not exists (select 1 from me) then 0
+        else (
+            select count(*)::int + 1
+            from times t, me
+            where t.map_number = map and t.time_ms < me.time_ms
+        )
+    end;
+$$;
@@ -0,0 +1,4 @@
+-- Backs the per-map ORDER BY time_ms LIMIT 10 leaderboard queries and
+-- the rank window functions in 0001.
+create index if not exists times_map_number_time_ms_idx
+    on times (map_number, time_ms);
@@ -0,0 +1,33 @@
+-- One-round-trip time submission: verify registration, record history,
+-- upsert the best time, and hand back what the bot needs to reply.
+-- Returns no rows when the player isn't registered.
+create or replace function submit_time(did text, map int, ms int)
+returns table (tm_username text, previous_best int)
+language plpgsql
+as $$
+declare
+    uname text;
+    prev int;
+begin
+    select p.tm_username into uname from players p where p.discord_id = did;
+    if uname is null then
+        return;
+    end if;
+
+    select t.time_ms into prev
+    from times t
+    where t.discord_id = did and t.map_number = map;
+
+    insert into time_history (discord_id, map_number, time_ms)
+    values (did, map, ms);
+
+    if prev is null or ms < prev then
+        insert into times (discord_id, map_number, time_ms)
+        values (did, map, ms)
+        on conflict (discord_id, map_number)
+        do update set time_ms = excluded.time_ms;
+    end if;
+
+    return query select uname, prev;
+end;
+$$;
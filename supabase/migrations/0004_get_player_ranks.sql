@@ -0,0 +1,18 @@
+-- All of a player's per-map ranks in one call, for !tm mystats
+-- (previously one full-leaderboard fetch per map).
+create or replace function get_player_ranks(did text)
+returns table (map_number int, pos int)
+language sql
+stable
+as $$
+    with ranked as (
+        select
+            discord_id,
+            map_number,
+            rank() over (partition by map_number order by time_ms asc) as pos
+        from times
+    )
+    select r.map_number, r.pos::int
+    from ranked r
+    where r.discord_id = did;
+$$;
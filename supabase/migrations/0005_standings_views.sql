@@ -0,0 +1,51 @@
+-- Leaderboard and standings as views: identical SQL every call, so let
+-- Postgres serve pre-aggregated rows instead of the bot re-deriving
+-- them. A plain view is fresh on every read, which is all the
+-- seconds-level staleness budget here needs.
+create or replace view map_leaderboard as
+select
+    t.map_number,
+    t.discord_id,
+    t.time_ms,
+    p.tm_username,
+    rank() over (partition by t.map_number order by t.time_ms asc) as pos
+from times t
+join players p using (discord_id);
+
+create or replace view overall_standings as
+select
+    discord_id,
+    tm_username,
+    sum(case pos
+        when 1 then 25
+        when 2 then 18
+        when 3 then 15
+        when 4 then 12
+        when 5 then 10
+        when 6 then 8
+        when 7 then 6
+        when 8 then 4
+        when 9 then 2
+        when 10 then 1
+        else 1
+    end) as points,
+    count(*) as maps_completed
+from map_leaderboard
+group by discord_id, tm_username;
+
+-- Re-point the RPC from 0001 at the view so the points table lives in
+-- exactly one place.
+create or replace function get_standings()
+returns table (
+    discord_id text,
+    tm_username text,
+    points bigint,
+    maps_completed bigint
+)
+language sql
+stable
+as $$
+    select discord_id, tm_username, points, maps_completed
+    from overall_standings
+    order by points desc, maps_completed desc;
+$$;
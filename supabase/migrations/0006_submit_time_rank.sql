@@ -0,0 +1,45 @@
+-- Return the player's map rank from submit_time itself, so the bot no
+-- longer needs a second round-trip just to decorate the reply embed.
+-- The return type changes, so the old signature has to be dropped.
+drop function if exists submit_time(text, int, int);
+
+create function submit_time(did text, map int, ms int)
+returns table (tm_username text, previous_best int, rank int)
+language plpgsql
+as $$
+declare
+    uname text;
+    prev int;
+    new_rank int;
+begin
+    select p.tm_username into uname from players p where p.discord_id = did;
+    if uname is null then
+        return;
+    end if;
+
+    select t.time_ms into prev
+    from times t
+    where t.discord_id = did and t.map_number = map;
+
+    insert into time_history (discord_id, map_number, time_ms)
+    values (did, map, ms);
+
+    if prev is null or ms < prev then
+        insert into times (discord_id, map_number, time_ms)
+        values (did, map, ms)
+        on conflict (discord_id, map_number)
+        do update set time_ms = excluded.time_ms;
+    end if;
+
+    -- Rank of the player's current best after the write
+    select count(*)::int + 1 into new_rank
+    from times t
+    where t.map_number = map
+      and t.time_ms < (
+          select time_ms from times
+          where discord_id = did and map_number = map
+      );
+
+    return query select uname, prev, new_rank;
+end;
+$$;